@@ -4,6 +4,7 @@ ASME 데이터베이스 검색 및 탐색 도구
 """
 
 import pandas as pd
+import numpy as np
 import json
 import re
 from typing import List, Dict, Optional, Tuple
@@ -15,45 +16,78 @@ class ASMEDataSearcher:
     
     def __init__(self, data_dir: str = "output"):
         self.data_dir = Path(data_dir)
-        self.tables = {}
-        self.charts = {}
-        self.load_all_data()
-    
-    def load_all_data(self):
-        """모든 추출된 데이터 로드"""
-        print("데이터 로딩 중...")
-        
-        # CSV 파일들 로드 (표 데이터)
-        csv_files = glob.glob(str(self.data_dir / "*.csv"))
-        for csv_file in csv_files:
+
+        # 파일 경로만 먼저 수집하고 실제 로드는 첫 접근 시로 미룸 (지연 로딩)
+        self._csv_paths = {Path(p).stem: p for p in glob.glob(str(self.data_dir / "*.csv"))}
+        self._json_paths = {Path(p).stem: p for p in glob.glob(str(self.data_dir / "*.json"))}
+        self._tables_cache = {}
+        self._charts_cache = {}
+        self._cols_lower = {}  # 표별 소문자 컬럼명 튜플 캐시
+
+        print(f"데이터 파일 발견: {len(self._csv_paths)}개 표, {len(self._json_paths)}개 그래프 (지연 로딩)")
+
+    def _get_table(self, table_name: str) -> Optional[pd.DataFrame]:
+        """표 데이터를 필요 시점에 로드 (첫 접근 이후 캐시)"""
+        if table_name not in self._tables_cache:
+            csv_file = self._csv_paths.get(table_name)
+            if csv_file is None:
+                return None
             try:
                 df = pd.read_csv(csv_file)
-                table_name = Path(csv_file).stem
-                self.tables[table_name] = df
+                self._tables_cache[table_name] = df
+                # 컬럼명 소문자 변환은 로드 시 한 번만 수행
+                self._cols_lower[table_name] = tuple(str(c).lower() for c in df.columns)
             except Exception as e:
                 print(f"CSV 파일 로드 실패: {csv_file} - {e}")
-        
-        # JSON 파일들 로드 (그래프 정보)
-        json_files = glob.glob(str(self.data_dir / "*.json"))
-        for json_file in json_files:
+                self._tables_cache[table_name] = None
+        return self._tables_cache[table_name]
+
+    def _get_chart(self, chart_name: str) -> Optional[Dict]:
+        """그래프 정보를 필요 시점에 로드 (첫 접근 이후 캐시)"""
+        if chart_name not in self._charts_cache:
+            json_file = self._json_paths.get(chart_name)
+            if json_file is None:
+                return None
             try:
                 with open(json_file, 'r', encoding='utf-8') as f:
-                    chart_data = json.load(f)
-                chart_name = Path(json_file).stem
-                self.charts[chart_name] = chart_data
+                    self._charts_cache[chart_name] = json.load(f)
             except Exception as e:
                 print(f"JSON 파일 로드 실패: {json_file} - {e}")
-        
+                self._charts_cache[chart_name] = None
+        return self._charts_cache[chart_name]
+
+    def _iter_tables(self):
+        """로드 가능한 모든 표를 (이름, DataFrame) 쌍으로 순회"""
+        for table_name in self._csv_paths:
+            df = self._get_table(table_name)
+            if df is not None:
+                yield table_name, df
+
+    @property
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        """모든 표 데이터 (접근 시 전체 로드, 하위 호환용)"""
+        return dict(self._iter_tables())
+
+    @property
+    def charts(self) -> Dict[str, Dict]:
+        """모든 그래프 정보 (접근 시 전체 로드, 하위 호환용)"""
+        return {name: chart for name in self._json_paths
+                if (chart := self._get_chart(name)) is not None}
+
+    def load_all_data(self):
+        """모든 추출된 데이터 즉시 로드 (하위 호환용)"""
+        print("데이터 로딩 중...")
         print(f"로드 완료: {len(self.tables)}개 표, {len(self.charts)}개 그래프")
     
     def search_material(self, material_name: str) -> List[Dict]:
         """특정 재료 검색"""
         results = []
-        
-        for table_name, df in self.tables.items():
+        needle = material_name.lower()  # 소문자 변환은 한 번만
+
+        for table_name, df in self._iter_tables():
             # 모든 컬럼에서 재료명 검색
             for col in df.columns:
-                if isinstance(col, str) and material_name.lower() in col.lower():
+                if isinstance(col, str) and needle in col.lower():
                     results.append({
                         'type': 'column_match',
                         'table': table_name,
@@ -61,19 +95,19 @@ class ASMEDataSearcher:
                         'data': df.head(5).to_dict('records')
                     })
             
-            # 데이터에서 재료명 검색
-            for idx, row in df.iterrows():
-                for col in df.columns:
-                    cell_value = str(row[col])
-                    if material_name.lower() in cell_value.lower():
-                        results.append({
-                            'type': 'data_match',
-                            'table': table_name,
-                            'row': idx,
-                            'column': col,
-                            'value': cell_value,
-                            'full_row': row.to_dict()
-                        })
+            # 데이터에서 재료명 검색 (셀 단위 순회 대신 numpy 마스크로 일괄 검색)
+            if len(df) > 0:
+                cell_values = df.astype(str).to_numpy(dtype=str)
+                mask = np.char.find(np.char.lower(cell_values), needle) >= 0
+                for r, c in zip(*np.nonzero(mask)):
+                    results.append({
+                        'type': 'data_match',
+                        'table': table_name,
+                        'row': df.index[r],
+                        'column': df.columns[c],
+                        'value': cell_values[r, c],
+                        'full_row': df.iloc[r].to_dict()
+                    })
         
         return results
     
@@ -81,13 +115,11 @@ class ASMEDataSearcher:
         """응력 값 검색"""
         results = []
         
-        for table_name, df in self.tables.items():
-            # 응력 관련 컬럼 찾기
-            stress_columns = []
-            for col in df.columns:
-                col_str = str(col).lower()
-                if any(keyword in col_str for keyword in ['stress', 'ksi', 'mpa', 'allowable', 'design']):
-                    stress_columns.append(col)
+        for table_name, df in self._iter_tables():
+            # 응력 관련 컬럼 찾기 (캐시된 소문자 컬럼명 사용)
+            cols_lower = self._cols_lower[table_name]
+            stress_columns = [df.columns[i] for i, cl in enumerate(cols_lower)
+                              if any(keyword in cl for keyword in ('stress', 'ksi', 'mpa', 'allowable', 'design'))]
             
             if stress_columns:
                 for col in stress_columns:
@@ -123,13 +155,11 @@ class ASMEDataSearcher:
         """온도 데이터 검색"""
         results = []
         
-        for table_name, df in self.tables.items():
-            # 온도 관련 컬럼 찾기
-            temp_columns = []
-            for col in df.columns:
-                col_str = str(col).lower()
-                if any(keyword in col_str for keyword in ['°f', 'f', 'temperature', 'temp']):
-                    temp_columns.append(col)
+        for table_name, df in self._iter_tables():
+            # 온도 관련 컬럼 찾기 (캐시된 소문자 컬럼명 사용)
+            cols_lower = self._cols_lower[table_name]
+            temp_columns = [df.columns[i] for i, cl in enumerate(cols_lower)
+                            if any(keyword in cl for keyword in ('°f', 'f', 'temperature', 'temp'))]
             
             if temp_columns:
                 for col in temp_columns:
@@ -164,12 +194,13 @@ class ASMEDataSearcher:
     def search_specification(self, spec_code: str) -> List[Dict]:
         """규격 코드 검색 (예: SA-516, ASTM A516 등)"""
         results = []
-        
-        for table_name, df in self.tables.items():
+        needle = spec_code.upper()  # 대문자 변환은 한 번만
+
+        for table_name, df in self._iter_tables():
             for idx, row in df.iterrows():
                 for col in df.columns:
                     cell_value = str(row[col])
-                    if spec_code.upper() in cell_value.upper():
+                    if needle in cell_value.upper():
                         results.append({
                             'table': table_name,
                             'row': idx,
@@ -184,7 +215,7 @@ class ASMEDataSearcher:
         """모든 표 요약 정보"""
         summary = {}
         
-        for table_name, df in self.tables.items():
+        for table_name, df in self._iter_tables():
             summary[table_name] = {
                 'rows': len(df),
                 'columns': len(df.columns),
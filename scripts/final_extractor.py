@@ -5,12 +5,37 @@
 
 import fitz  # PyMuPDF
 import pandas as pd
+import numpy as np
 import re
 import json
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import logging
 
+# CSV 기록 가속용 (C 레벨 포매터, 없으면 pandas to_csv로 대체)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+# 표 행 판단용 정규식 (매 호출마다 컴파일하지 않도록 모듈 수준에서 미리 컴파일)
+_NUM_RE = re.compile(r'\d+\.?\d*')
+_TEMP_RE = re.compile(r'\d+°?F')
+_STRESS_RE = re.compile(r'\d+\.?\d*\s*(ksi|MPa|psi)')
+# 그래프 제목 패턴 (4개 패턴을 하나의 교대 패턴으로 결합해 텍스트를 한 번만 스캔)
+_CHART_TITLE_RE = re.compile(
+    r'Chart\s+[A-Z]+-\d+|Figure\s+\d+|E-\d+\.\d+-\d+|Average Isochronous Stress.*Curves',
+    re.IGNORECASE
+)
+_ASME_KW_RE = re.compile(
+    r'sa-|astm|carbon|steel|alloy|nickel|chrome|molybdenum|titanium|'
+    r'aluminum|copper|brass|plate|pipe|tube|forging|cast|weld|'
+    r'line|no|nominal|composition|product|form|spec|type|grade|uns|'
+    r'class|condition|temper|size|thickness|p-number|group|notes'
+)
+
 class FinalASMEExtractor:
     """최종 ASME 데이터 추출기"""
     
@@ -52,13 +77,10 @@ class FinalASMEExtractor:
     def extract_complete_database(self, page_range: Optional[tuple] = None) -> Dict:
         """완전한 ASME 데이터베이스 추출"""
         self.logger.info("ASME 데이터베이스 추출 시작")
-        
-        # 1. 표 데이터 추출
-        tables = self.extract_all_tables(page_range)
-        
-        # 2. 그래프 데이터 추출
-        charts = self.extract_all_charts(page_range)
-        
+
+        # 1. 표 + 그래프 데이터 추출 (단일 패스)
+        tables, charts = self.extract_all(page_range)
+
         # 3. 메타데이터 생성
         metadata = self.generate_metadata(tables, charts)
         
@@ -71,43 +93,79 @@ class FinalASMEExtractor:
             'metadata': metadata
         }
     
-    def extract_all_tables(self, page_range: Optional[tuple] = None) -> Dict[str, pd.DataFrame]:
-        """모든 표 데이터 추출"""
-        self.logger.info("표 데이터 추출 시작")
-        
+    def extract_all(self, page_range: Optional[tuple] = None) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict]]:
+        """모든 표 + 그래프 데이터를 단일 패스로 추출
+
+        PDF를 한 번만 열고 페이지당 한 번씩 파싱하여
+        표와 그래프를 동시에 추출 (기존에는 문서를 두 번 파싱)
+        """
+        self.logger.info("표/그래프 데이터 추출 시작")
+
         doc = fitz.open(self.pdf_path)
         all_tables = {}
-        
+        all_charts = {}
+
         if page_range:
             start_page, end_page = page_range
             pages = range(start_page - 1, min(end_page, len(doc)))
         else:
             pages = range(len(doc))
-        
+
         for page_num in pages:
             page = doc[page_num]
-            self.logger.info(f"페이지 {page_num + 1} 표 추출 중...")
-            
+            self.logger.info(f"페이지 {page_num + 1} 추출 중...")
+
             # 페이지에서 표 추출
             page_tables = self._extract_tables_from_page(page)
-            
+
             for i, table_data in enumerate(page_tables):
                 if table_data is not None and not table_data.empty:
                     table_name = f"Page_{page_num + 1}_Table_{i + 1}"
                     all_tables[table_name] = table_data
-                    
+
                     # CSV로 저장
                     csv_path = self.output_dir / f"{table_name}.csv"
-                    table_data.to_csv(csv_path, index=False)
+                    self._write_csv(table_data, csv_path)
                     self.logger.info(f"표 저장: {csv_path}")
-        
+
+            # 같은 페이지에서 그래프 정보 추출
+            page_charts = self._extract_charts_from_page(page)
+
+            for i, chart_info in enumerate(page_charts):
+                if chart_info:
+                    chart_name = f"Page_{page_num + 1}_Chart_{i + 1}"
+                    all_charts[chart_name] = chart_info
+
+                    # JSON으로 저장
+                    json_path = self.output_dir / f"{chart_name}.json"
+                    with open(json_path, 'w', encoding='utf-8') as f:
+                        json.dump(chart_info, f, indent=2, ensure_ascii=False)
+                    self.logger.info(f"그래프 정보 저장: {json_path}")
+
         doc.close()
-        return all_tables
+        return all_tables, all_charts
+
+    def _write_csv(self, table_data: pd.DataFrame, csv_path: Path) -> None:
+        """CSV 저장 (pyarrow가 있으면 C 레벨 포매터 사용)"""
+        if pacsv is not None:
+            try:
+                pacsv.write_csv(pa.Table.from_pandas(table_data, preserve_index=False), str(csv_path))
+                return
+            except Exception as e:
+                self.logger.warning(f"pyarrow CSV 저장 실패, to_csv로 대체: {e}")
+        table_data.to_csv(csv_path, index=False)
+
+    def extract_all_tables(self, page_range: Optional[tuple] = None) -> Dict[str, pd.DataFrame]:
+        """모든 표 데이터 추출 (하위 호환용 래퍼)"""
+        tables, _ = self.extract_all(page_range)
+        return tables
     
     def _extract_tables_from_page(self, page) -> List[Optional[pd.DataFrame]]:
         """페이지에서 표 추출"""
         # 페이지의 텍스트 블록을 좌표별로 추출
-        blocks = page.get_text("dict")["blocks"]
+        # 이미지 블록/리가처 보존 없이 텍스트만 요청해 페이지당 할당량 절감
+        textpage = page.get_textpage(flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        blocks = textpage.extractDICT()["blocks"]
         
         # 텍스트를 좌표 순서대로 정렬
         text_elements = []
@@ -162,120 +220,69 @@ class FinalASMEExtractor:
         """표 행인지 판단"""
         if not row_text or len(row_text) < 2:
             return False
-        
-        # 텍스트 결합
+
+        # 텍스트 결합 (소문자 변환은 한 번만)
         text = ' '.join(row_text)
-        
+        text_lower = text.lower()
+
+        # 숫자 개수가 가장 싼 판별 기준이므로 먼저 확인하고 조기 탈락
+        numbers = _NUM_RE.findall(text)
+        if len(numbers) < 2:
+            return False
+
         # 온도 패턴 확인
-        temp_pattern = r'\d+°?F'
-        has_temp = bool(re.search(temp_pattern, text))
-        
-        # 응력/강도 패턴 확인
-        stress_pattern = r'\d+\.?\d*\s*(ksi|MPa|psi)'
-        has_stress = bool(re.search(stress_pattern, text))
-        
-        # ASME 키워드 확인
-        asme_keywords = [
-            'SA-', 'ASTM', 'Carbon', 'Steel', 'Alloy', 'Nickel', 'Chrome',
-            'Molybdenum', 'Titanium', 'Aluminum', 'Copper', 'Brass',
-            'Plate', 'Pipe', 'Tube', 'Forging', 'Cast', 'Weld',
-            'Line', 'No', 'Nominal', 'Composition', 'Product', 'Form',
-            'Spec', 'Type', 'Grade', 'UNS', 'Class', 'Condition', 'Temper',
-            'Size', 'Thickness', 'P-Number', 'Group', 'Notes'
-        ]
-        
-        has_keywords = any(keyword.lower() in text.lower() for keyword in asme_keywords)
-        
-        # 숫자 패턴 확인
-        numbers = re.findall(r'\d+\.?\d*', text)
-        has_numbers = len(numbers) >= 2
-        
-        # 표 행 판단 조건
-        return (has_temp and has_stress) or (has_numbers and has_keywords) or (has_temp and has_numbers)
+        has_temp = bool(_TEMP_RE.search(text))
+
+        # 온도 + 응력/강도 패턴이 모두 있으면 표 행
+        if has_temp and _STRESS_RE.search(text):
+            return True
+
+        # ASME 키워드가 있으면 표 행
+        if _ASME_KW_RE.search(text_lower):
+            return True
+
+        # 숫자 2개 이상 + 온도만 있는 경우
+        return has_temp
     
     def _create_dataframe_from_rows(self, rows: List[List[str]]) -> Optional[pd.DataFrame]:
         """행 데이터로부터 DataFrame 생성"""
         if len(rows) < 2:
             return None
-        
-        # 컬럼 수 통일
-        max_cols = max(len(row) for row in rows)
-        normalized_rows = []
-        for row in rows:
-            normalized_row = row + [''] * (max_cols - len(row))
-            normalized_rows.append(normalized_row)
-        
-        # DataFrame 생성
-        df = pd.DataFrame(normalized_rows)
-        
-        # 첫 번째 행을 헤더로 사용
-        if len(df) > 0:
-            df.columns = df.iloc[0]
-            df = df.iloc[1:]
-        
-        # 빈 행 제거
-        df = df.dropna(how='all')
-        
+
+        # 2차원 object 배열 하나에 바로 채워 넣기 (행별 패딩 리스트 생성 제거)
+        max_cols = max(map(len, rows))
+        arr = np.full((len(rows), max_cols), '', dtype=object)
+        for i, row in enumerate(rows):
+            arr[i, :len(row)] = row
+
+        # 첫 번째 행을 헤더로, 완전히 빈 행은 제거
+        body = arr[1:]
+        mask = (body != '').any(axis=1)
+        df = pd.DataFrame(body[mask], columns=arr[0])
+
         return df if not df.empty else None
     
     def extract_all_charts(self, page_range: Optional[tuple] = None) -> Dict[str, Dict]:
-        """모든 그래프 데이터 추출"""
-        self.logger.info("그래프 데이터 추출 시작")
-        
-        doc = fitz.open(self.pdf_path)
-        all_charts = {}
-        
-        if page_range:
-            start_page, end_page = page_range
-            pages = range(start_page - 1, min(end_page, len(doc)))
-        else:
-            pages = range(len(doc))
-        
-        for page_num in pages:
-            page = doc[page_num]
-            self.logger.info(f"페이지 {page_num + 1} 그래프 추출 중...")
-            
-            # 페이지에서 그래프 정보 추출
-            page_charts = self._extract_charts_from_page(page)
-            
-            for i, chart_info in enumerate(page_charts):
-                if chart_info:
-                    chart_name = f"Page_{page_num + 1}_Chart_{i + 1}"
-                    all_charts[chart_name] = chart_info
-                    
-                    # JSON으로 저장
-                    json_path = self.output_dir / f"{chart_name}.json"
-                    with open(json_path, 'w', encoding='utf-8') as f:
-                        json.dump(chart_info, f, indent=2, ensure_ascii=False)
-                    self.logger.info(f"그래프 정보 저장: {json_path}")
-        
-        doc.close()
-        return all_charts
+        """모든 그래프 데이터 추출 (하위 호환용 래퍼)"""
+        _, charts = self.extract_all(page_range)
+        return charts
     
     def _extract_charts_from_page(self, page) -> List[Optional[Dict]]:
         """페이지에서 그래프 정보 추출"""
         text = page.get_text()
         charts = []
-        
-        # 그래프 제목 패턴 찾기
-        chart_patterns = [
-            r'Chart\s+[A-Z]+-\d+',
-            r'Figure\s+\d+',
-            r'E-\d+\.\d+-\d+',
-            r'Average Isochronous Stress.*Curves'
-        ]
-        
-        for pattern in chart_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                chart_info = {
-                    'title': match,
-                    'page': page.number + 1,
-                    'type': self._determine_chart_type(match),
-                    'description': self._extract_chart_description(text, match)
-                }
-                charts.append(chart_info)
-        
+
+        # 결합된 패턴으로 한 번의 스캔으로 모든 그래프 제목 찾기
+        for m in _CHART_TITLE_RE.finditer(text):
+            title = m.group(0)
+            chart_info = {
+                'title': title,
+                'page': page.number + 1,
+                'type': self._determine_chart_type(title),
+                'description': self._extract_chart_description(text, title, m.start())
+            }
+            charts.append(chart_info)
+
         return charts
     
     def _determine_chart_type(self, title: str) -> str:
@@ -291,19 +298,21 @@ class FinalASMEExtractor:
         else:
             return 'other_curves'
     
-    def _extract_chart_description(self, text: str, title: str) -> str:
+    def _extract_chart_description(self, text: str, title: str, start: Optional[int] = None) -> str:
         """그래프 설명 추출"""
-        # 제목 주변의 텍스트에서 설명 추출
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if title in line:
-                # 다음 몇 줄을 설명으로 사용
-                description_lines = []
-                for j in range(i, min(i + 3, len(lines))):
-                    if lines[j].strip():
-                        description_lines.append(lines[j].strip())
-                return ' '.join(description_lines)
-        return ""
+        # 매치 위치를 이미 알고 있으면 재검색 없이 해당 줄부터 사용
+        if start is None:
+            start = text.find(title)
+            if start == -1:
+                return ""
+
+        # 제목이 포함된 줄의 시작 위치로 이동
+        line_start = text.rfind('\n', 0, start) + 1
+        lines = text[line_start:].split('\n', 3)
+
+        # 다음 몇 줄을 설명으로 사용
+        description_lines = [line.strip() for line in lines[:3] if line.strip()]
+        return ' '.join(description_lines)
     
     def generate_metadata(self, tables: Dict, charts: Dict) -> Dict:
         """메타데이터 생성"""
@@ -2,20 +2,70 @@
 개선된 표 감지 및 추출 알고리즘
 """
 
+import os
+
+# Tesseract 내부 OpenMP 스레딩은 외부 병렬화와 경합하므로 제한 (pytesseract import 전에 설정)
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 import cv2
 import numpy as np
 import pandas as pd
-from typing import List, Tuple, Optional
+import threading
+from typing import List, Dict, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 import pytesseract
 from PIL import Image
 import re
 
+# tesserocr가 있으면 LSTM 모델을 한 번만 로드하는 영속 API 사용
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# 공백 정리용 정규식 (셀마다 재컴파일하지 않도록 모듈 수준에 캐시)
+_WS_RE = re.compile(r'\s+')
+
+# 런 길이 인코딩 모폴로지 (opencv-contrib의 ximgproc.rl, 없으면 밀집 연산으로 대체)
+_HAS_RL_MORPH = hasattr(cv2, 'ximgproc') and hasattr(cv2.ximgproc, 'rl')
+
+# 단어→셀 배분 커널 JIT 컴파일 (numba가 없으면 numpy 경로 사용)
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _assign_cells_jit(cx, cy, v_lines, h_lines):
+        n = cx.shape[0]
+        row_idx = np.empty(n, dtype=np.int64)
+        col_idx = np.empty(n, dtype=np.int64)
+        for i in prange(n):
+            col_idx[i] = np.searchsorted(v_lines, cx[i]) - 1
+            row_idx[i] = np.searchsorted(h_lines, cy[i]) - 1
+        return row_idx, col_idx
+
+
+def _assign_cells(cx: np.ndarray, cy: np.ndarray, v_lines, h_lines):
+    """단어 중심 좌표를 격자 셀 인덱스로 배분"""
+    if _HAS_NUMBA:
+        return _assign_cells_jit(
+            np.asarray(cx, dtype=np.float64), np.asarray(cy, dtype=np.float64),
+            np.asarray(v_lines, dtype=np.float64), np.asarray(h_lines, dtype=np.float64)
+        )
+    return np.searchsorted(h_lines, cy) - 1, np.searchsorted(v_lines, cx) - 1
+
 class ImprovedTableDetector:
     """개선된 표 감지 클래스"""
     
     def __init__(self):
         self.min_table_area = 5000  # 최소 표 면적
         self.min_cell_area = 100    # 최소 셀 면적
+        # 셀 OCR용 영속 Tesseract API — tesserocr API는 스레드 안전하지 않으므로
+        # 배치 추출의 스레드 풀에서도 겹치지 않도록 스레드별로 하나씩 보관
+        self._tess_local = threading.local()
         
     def detect_tables(self, image_path: str) -> List[pd.DataFrame]:
         """이미지에서 표 감지 및 추출"""
@@ -29,9 +79,11 @@ class ImprovedTableDetector:
         
         # 이미지 전처리
         processed = self._preprocess_image(gray)
-        
-        # 표 영역 감지
-        table_regions = self._detect_table_regions(processed)
+
+        # 표 영역 감지 — 선 위치만 필요하므로 1/4 해상도에서 감지 후 좌표 복원
+        small = cv2.pyrDown(cv2.pyrDown(processed))
+        table_regions = [(x * 4, y * 4, w * 4, h * 4)
+                         for (x, y, w, h) in self._detect_table_regions(small, scale=4)]
         
         tables = []
         for region in table_regions:
@@ -43,65 +95,86 @@ class ImprovedTableDetector:
     
     def _preprocess_image(self, gray: np.ndarray) -> np.ndarray:
         """이미지 전처리"""
-        # 노이즈 제거
-        denoised = cv2.fastNlMeansDenoising(gray)
+        # 노이즈 제거 (인쇄된 표 페이지에는 NL-means는 과도 — 가벼운 가우시안 블러로 충분)
+        denoised = cv2.GaussianBlur(gray, (3, 3), 0)
         
-        # 이진화
-        _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-        
-        # 모폴로지 연산으로 텍스트 라인 강화
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-        morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-        
-        return morph
+        # 이진화 (u8 이진 마스크 그대로 반환)
+        # 후속 단계가 40픽셀급 열기 연산이라 3×3 닫기는 효과가 흡수되는 죽은 작업
+        _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+
+        return binary
     
-    def _detect_table_regions(self, processed: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        """표 영역 감지"""
-        # 수평선과 수직선 감지
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
-        
-        horizontal_lines = cv2.morphologyEx(processed, cv2.MORPH_OPEN, horizontal_kernel)
-        vertical_lines = cv2.morphologyEx(processed, cv2.MORPH_OPEN, vertical_kernel)
-        
-        # 선 결합
-        table_structure = cv2.addWeighted(horizontal_lines, 0.5, vertical_lines, 0.5, 0.0)
-        
-        # 윤곽선 찾기
-        contours, _ = cv2.findContours(table_structure, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        table_regions = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > self.min_table_area:
-                x, y, w, h = cv2.boundingRect(contour)
-                table_regions.append((x, y, w, h))
-        
-        return table_regions
+    def _morph_open_lines(self, processed: np.ndarray, kernel_size: Tuple[int, int]) -> np.ndarray:
+        """긴 직선 구조 요소의 열기 연산
+
+        40픽셀급 구조 요소에서는 이진 이미지를 런 길이 인코딩으로 변환해
+        연산하는 편이 밀집 모폴로지보다 훨씬 빠르다. contrib 모듈이 없으면
+        기존 밀집 연산으로 대체.
+        """
+        if _HAS_RL_MORPH:
+            rle = cv2.ximgproc.rl.threshold(processed, 127, cv2.THRESH_BINARY)
+            rl_kernel = cv2.ximgproc.rl.getStructuringElement(cv2.MORPH_RECT, kernel_size)
+            opened = cv2.ximgproc.rl.morphologyEx(rle, cv2.MORPH_OPEN, rl_kernel)
+            mask = np.zeros_like(processed)
+            cv2.ximgproc.rl.paint(mask, opened, 255)
+            return mask
+
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, kernel_size)
+        return cv2.morphologyEx(processed, cv2.MORPH_OPEN, kernel, borderType=cv2.BORDER_REPLICATE)
+
+    def _detect_table_regions(self, processed: np.ndarray, scale: int = 1) -> List[Tuple[int, int, int, int]]:
+        """표 영역 감지 (scale: 입력이 원본 대비 1/scale 해상도일 때)"""
+        # 수평선과 수직선 감지 ((40,1)×(1,40) 분리형 구조 요소, 해상도에 맞게 축소)
+        line_len = max(3, 40 // scale)
+        horizontal_lines = self._morph_open_lines(processed, (line_len, 1))
+        vertical_lines = self._morph_open_lines(processed, (1, line_len))
+        
+        # 선 결합 (이진 마스크이므로 부동소수점 가중합 대신 단일 u8 OR 패스)
+        table_structure = cv2.bitwise_or(horizontal_lines, vertical_lines)
+        
+        # 연결 요소 분석 — findContours+contourArea+boundingRect 세 패스를
+        # connectedComponentsWithStats 한 패스로 통합 (면적/바운딩박스 동시 계산)
+        num_labels, _, stats, _ = cv2.connectedComponentsWithStats(table_structure, connectivity=8)
+
+        # 축소된 해상도에서는 면적 기준도 같은 비율로 축소
+        min_area = self.min_table_area / (scale * scale)
+
+        # 라벨 0은 배경 — 제외하고 면적 기준으로 일괄 필터링
+        stats = stats[1:]
+        boxes = stats[stats[:, cv2.CC_STAT_AREA] > min_area,
+                      cv2.CC_STAT_LEFT:cv2.CC_STAT_HEIGHT + 1]
+
+        return [tuple(int(v) for v in box) for box in boxes]
     
     def _extract_table_from_region(self, image: np.ndarray, region: Tuple[int, int, int, int]) -> Optional[pd.DataFrame]:
         """표 영역에서 데이터 추출"""
         x, y, w, h = region
         table_region = image[y:y+h, x:x+w]
-        
+
         # 그레이스케일 변환
         gray_region = cv2.cvtColor(table_region, cv2.COLOR_BGR2GRAY)
-        
-        # 셀 경계 감지
-        cells = self._detect_cells(gray_region)
-        
-        if not cells:
+
+        # 격자선 감지
+        h_lines, v_lines = self._detect_grid_lines(gray_region)
+
+        if len(h_lines) < 2 or len(v_lines) < 2:
             return None
-        
-        # 각 셀에서 텍스트 추출
-        table_data = []
-        for row in cells:
-            row_data = []
-            for cell in row:
-                text = self._extract_text_from_cell(gray_region, cell)
-                row_data.append(text)
-            table_data.append(row_data)
-        
+
+        # 영역 전체를 한 번만 OCR하고 단어를 셀에 배분 (셀 단위 OCR 호출 제거)
+        table_data = self._extract_texts_batched(gray_region, h_lines, v_lines)
+
+        if table_data is None:
+            # 배치 OCR 실패 시 셀 단위 OCR로 대체
+            X, Y, W, H = self._build_cells(h_lines, v_lines)
+            n_rows, n_cols = X.shape
+            table_data = []
+            for i in range(n_rows):
+                row_data = []
+                for j in range(n_cols):
+                    text = self._extract_text_from_cell(gray_region, (X[i, j], Y[i, j], W[i, j], H[i, j]))
+                    row_data.append(text)
+                table_data.append(row_data)
+
         if not table_data:
             return None
         
@@ -115,78 +188,123 @@ class ImprovedTableDetector:
         
         return df
     
-    def _detect_cells(self, gray_region: np.ndarray) -> List[List[Tuple[int, int, int, int]]]:
-        """셀 경계 감지"""
-        # 수평선과 수직선 감지
+    def _detect_grid_lines(self, gray_region: np.ndarray) -> Tuple[List[int], List[int]]:
+        """표 격자의 수평/수직선 좌표 감지"""
         horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (gray_region.shape[1]//10, 1))
         vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, gray_region.shape[0]//10))
-        
+
         horizontal_lines = cv2.morphologyEx(gray_region, cv2.MORPH_OPEN, horizontal_kernel)
         vertical_lines = cv2.morphologyEx(gray_region, cv2.MORPH_OPEN, vertical_kernel)
-        
+
         # 선 좌표 추출
         h_lines = self._get_line_coordinates(horizontal_lines, 'horizontal')
         v_lines = self._get_line_coordinates(vertical_lines, 'vertical')
-        
-        # 셀 생성
-        cells = []
-        for i in range(len(h_lines) - 1):
-            row = []
-            for j in range(len(v_lines) - 1):
-                cell = (
-                    v_lines[j],
-                    h_lines[i],
-                    v_lines[j+1] - v_lines[j],
-                    h_lines[i+1] - h_lines[i]
-                )
-                row.append(cell)
-            cells.append(row)
-        
-        return cells
+
+        return h_lines, v_lines
+
+    def _build_cells(self, h_lines: List[int], v_lines: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """격자선 좌표로부터 셀 경계 생성
+
+        셀마다 파이썬 튜플을 만드는 대신 (n_rows, n_cols) 모양의
+        X/Y/W/H int32 배열 4개로 반환 (SoA 배치)
+        """
+        v = np.asarray(v_lines, dtype=np.int32)
+        h = np.asarray(h_lines, dtype=np.int32)
+
+        X, Y = np.meshgrid(v[:-1], h[:-1])
+        W, H = np.meshgrid(np.diff(v), np.diff(h))
+
+        return X, Y, W, H
+
+    def _detect_cells(self, gray_region: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """셀 경계 감지 (X/Y/W/H int32 배열)"""
+        h_lines, v_lines = self._detect_grid_lines(gray_region)
+        return self._build_cells(h_lines, v_lines)
+
+    def _extract_texts_batched(self, gray_region: np.ndarray, h_lines: List[int], v_lines: List[int]) -> Optional[List[List[str]]]:
+        """표 영역 전체를 한 번만 OCR하고 단어 좌표로 셀에 배분
+
+        셀마다 Tesseract를 호출하면 초기화 비용이 셀 수만큼 반복되므로,
+        image_to_data 한 번으로 단어별 경계 상자를 받아 격자에 매핑한다.
+        """
+        try:
+            data = pytesseract.image_to_data(
+                gray_region,
+                config='--oem 3 --psm 6',
+                output_type=pytesseract.Output.DATAFRAME
+            )
+        except Exception:
+            return None
+
+        # 인식 실패 항목 제거
+        data = data[(data['conf'] >= 0) & data['text'].notna()]
+
+        n_rows = len(h_lines) - 1
+        n_cols = len(v_lines) - 1
+        grid = [['' for _ in range(n_cols)] for _ in range(n_rows)]
+
+        if len(data) > 0:
+            # 단어 중심 좌표를 격자선에 이진 탐색으로 배분
+            cx = (data['left'] + data['width'] / 2).to_numpy()
+            cy = (data['top'] + data['height'] / 2).to_numpy()
+            row_idx, col_idx = _assign_cells(cx, cy, v_lines, h_lines)
+
+            for word, r, c in zip(data['text'], row_idx, col_idx):
+                if 0 <= r < n_rows and 0 <= c < n_cols:
+                    word = str(word).strip()
+                    if word:
+                        grid[r][c] = f"{grid[r][c]} {word}".strip()
+
+        return grid
     
     def _get_line_coordinates(self, lines_image: np.ndarray, direction: str) -> List[int]:
         """선 좌표 추출"""
-        coordinates = []
-        
+        # 행/열 단위 축소를 OpenCV SIMD 커널로 수행한 뒤,
+        # 1차원 벡터의 0이 아닌 인덱스가 곧 선 좌표가 된다
         if direction == 'horizontal':
-            # 수평선의 y 좌표 추출
-            for i in range(lines_image.shape[0]):
-                if np.sum(lines_image[i, :]) > 0:
-                    coordinates.append(i)
+            # 수평선의 y 좌표 추출 (각 행을 1바이트로 축소)
+            reduced = cv2.reduce(lines_image, 1, cv2.REDUCE_MAX)
         else:
-            # 수직선의 x 좌표 추출
-            for j in range(lines_image.shape[1]):
-                if np.sum(lines_image[:, j]) > 0:
-                    coordinates.append(j)
-        
-        # 중복 제거 및 정렬
-        coordinates = sorted(list(set(coordinates)))
-        
-        # 너무 가까운 선 제거
-        filtered_coordinates = []
-        for coord in coordinates:
-            if not filtered_coordinates or abs(coord - filtered_coordinates[-1]) > 10:
-                filtered_coordinates.append(coord)
-        
-        return filtered_coordinates
+            # 수직선의 x 좌표 추출 (각 열을 1바이트로 축소)
+            reduced = cv2.reduce(lines_image, 0, cv2.REDUCE_MAX)
+        coordinates = np.flatnonzero(reduced.ravel())
+
+        if len(coordinates) == 0:
+            return []
+
+        # 너무 가까운 선 제거 — 마지막으로 채택한 좌표와 10 초과로 떨어진 것만 유지
+        # (축소 후 좌표 수는 작으므로 채택 기준을 따라가는 순차 스캔으로 충분)
+        coords = coordinates.tolist()
+        filtered = [coords[0]]
+        for coord in coords[1:]:
+            if coord - filtered[-1] > 10:
+                filtered.append(coord)
+        return filtered
     
     def _extract_text_from_cell(self, gray_region: np.ndarray, cell: Tuple[int, int, int, int]) -> str:
         """셀에서 텍스트 추출"""
         x, y, w, h = cell
-        
+
         # 셀 영역 추출
         cell_region = gray_region[y:y+h, x:x+w]
-        
-        # OCR 설정
-        config = '--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,()-/°F'
-        
-        # 텍스트 추출
-        text = pytesseract.image_to_string(cell_region, config=config)
+
+        # 셀 크롭은 한 줄 텍스트이므로 PSM 7로 레이아웃 분석 생략
+        # (문자 화이트리스트는 호출마다 Tesseract가 재파싱하므로 제거)
+        if tesserocr is not None:
+            # 영속 API로 LSTM 모델 로드를 셀마다 반복하지 않음 (스레드별 인스턴스)
+            api = getattr(self._tess_local, 'api', None)
+            if api is None:
+                api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE)
+                self._tess_local.api = api
+            api.SetImage(Image.fromarray(cell_region))
+            text = api.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(cell_region, config='--oem 3 --psm 7')
         
         # 텍스트 정제
         text = text.strip()
-        text = re.sub(r'\s+', ' ', text)  # 여러 공백을 하나로
-        
+        text = _WS_RE.sub(' ', text)  # 여러 공백을 하나로
+
         return text
     
     def extract_asme_tables(self, image_path: str) -> List[pd.DataFrame]:
@@ -201,6 +319,16 @@ class ImprovedTableDetector:
         
         return asme_tables
     
+    def extract_asme_tables_batch(self, image_paths: List[str]) -> Dict[str, List[pd.DataFrame]]:
+        """여러 페이지 이미지를 스레드 풀로 병렬 OCR
+
+        Tesseract 호출 동안 GIL이 해제되므로 페이지 단위 스레드 병렬화가 유효하다.
+        """
+        max_workers = max(1, (os.cpu_count() or 4) // 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.extract_asme_tables, image_paths)
+        return dict(zip(image_paths, results))
+
     def _is_asme_table(self, table: pd.DataFrame) -> bool:
         """ASME 표인지 판단"""
         if table.empty:
@@ -221,23 +349,26 @@ class ImprovedTableDetector:
 
 def main():
     """테스트 함수"""
+    import glob
+
     detector = ImprovedTableDetector()
-    
-    # 테스트 이미지 경로
-    test_image = "output/page_0002.png"
-    
+
+    # 테스트 이미지 경로 (페이지 이미지들을 병렬로 처리)
+    test_images = sorted(glob.glob("output/page_*.png")) or ["output/page_0002.png"]
+
     print("개선된 표 감지 테스트 시작...")
-    
-    # ASME 표 추출
-    asme_tables = detector.extract_asme_tables(test_image)
-    
-    print(f"감지된 ASME 표 수: {len(asme_tables)}")
-    
-    for i, table in enumerate(asme_tables):
-        print(f"\n표 {i+1}:")
-        print(f"크기: {table.shape}")
-        print(f"컬럼: {list(table.columns)}")
-        print(table.head())
+
+    # ASME 표 병렬 추출
+    results = detector.extract_asme_tables_batch(test_images)
+
+    for image_path, asme_tables in results.items():
+        print(f"\n{image_path}: 감지된 ASME 표 수: {len(asme_tables)}")
+
+        for i, table in enumerate(asme_tables):
+            print(f"\n표 {i+1}:")
+            print(f"크기: {table.shape}")
+            print(f"컬럼: {list(table.columns)}")
+            print(table.head())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,12 +4,92 @@
 """
 
 import pandas as pd
+import numpy as np
+import csv
 import json
+import os
 import re
 import sys
-import glob
 from pathlib import Path
 
+# 검색 타입별 컬럼 키워드 (호출마다 리스트를 새로 만들지 않도록 모듈 수준 상수)
+_STRESS_KEYWORDS = ('stress', 'ksi', 'mpa')
+_TEMP_KEYWORDS = ('°f', 'f', 'temperature')
+
+def _fresh_parquet_cache(csv_file: str):
+    """CSV보다 최신인 Parquet 캐시 경로 반환 (없으면 None)"""
+    csv_path = Path(csv_file)
+    parquet_path = csv_path.with_suffix('.parquet')
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return parquet_path
+    return None
+
+def _load_table(csv_file: str) -> pd.DataFrame:
+    """표 로드 (첫 로드 시 Parquet 캐시 생성, 이후에는 캐시 사용)
+
+    검색은 같은 CSV를 매 실행마다 다시 파싱하므로, 한 번 파싱한 결과를
+    압축 컬럼 포맷으로 저장해 두면 이후 호출이 수십 배 빨라진다.
+    """
+    parquet_path = _fresh_parquet_cache(csv_file)
+    if parquet_path is not None:
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            pass
+
+    df = pd.read_csv(csv_file)
+    try:
+        df.to_parquet(Path(csv_file).with_suffix('.parquet'), compression='zstd')
+    except Exception:
+        pass  # pyarrow 미설치 등 — 캐시 없이 진행
+    return df
+
+def _read_matching_columns(csv_file: str, keywords: tuple):
+    """키워드에 맞는 컬럼만 골라서 CSV 파싱 (컬럼 푸시다운)
+
+    헤더만 먼저 읽어 대상 컬럼을 정하고, 본문은 해당 컬럼만
+    (가능하면 멀티스레드 pyarrow 엔진으로) 파싱한다.
+    """
+    # 헤더 행을 원본 그대로 읽어 대상 컬럼 위치를 정한다
+    # (pd.read_csv는 중복 헤더를 '100F.1'식으로 바꿔 놓아 이름 매칭이 어긋난다)
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        raw_cols = next(csv.reader(f), [])
+
+    keep_idx = [i for i, c in enumerate(raw_cols)
+                if any(k in str(c).lower() for k in keywords)]
+    if not keep_idx:
+        return None
+
+    if len(raw_cols) != len(set(raw_cols)):
+        # 중복 헤더가 있으면 usecols 이름 매칭이 깨지므로
+        # 컬럼 푸시다운 대신 전체를 읽고 위치 기반으로 잘라낸다
+        return _load_table(csv_file).iloc[:, keep_idx]
+
+    usecols = [raw_cols[i] for i in keep_idx]
+
+    # Parquet 캐시가 있으면 필요한 컬럼만 바로 읽기
+    parquet_path = _fresh_parquet_cache(csv_file)
+    if parquet_path is not None:
+        try:
+            return pd.read_parquet(parquet_path, columns=usecols)
+        except Exception:
+            pass
+
+    try:
+        return pd.read_csv(csv_file, usecols=usecols, engine='pyarrow', dtype_backend='pyarrow')
+    except (ImportError, ValueError, TypeError):
+        return pd.read_csv(csv_file, usecols=usecols)
+
+def _find_cell_matches(df: pd.DataFrame, term: str):
+    """모든 셀에서 검색어가 포함된 위치를 (행, 열, 값) 목록으로 반환
+
+    셀 단위 파이썬 루프 대신 벡터화된 str.contains 마스크로 검색
+    """
+    str_df = df.astype(str)
+    mask = str_df.apply(lambda s: s.str.contains(term, case=False, na=False, regex=False))
+    return [(df.index[r], df.columns[c], str_df.iat[r, c])
+            for r, c in np.argwhere(mask.to_numpy())]
+
 def quick_search(search_term: str, search_type: str = "all"):
     """빠른 검색 함수"""
     data_dir = Path("output")
@@ -20,21 +100,33 @@ def quick_search(search_term: str, search_type: str = "all"):
         return
     
     print(f"🔍 '{search_term}' 검색 중...")
-    
-    # CSV 파일들 검색
-    csv_files = glob.glob(str(data_dir / "*.csv"))
+
+    term_lower = search_term.lower()  # 소문자 변환은 한 번만 수행
+
+    # CSV 파일들 검색 (glob 패턴 매칭 대신 scandir로 디렉토리 한 번만 순회)
+    with os.scandir(data_dir) as entries:
+        csv_files = sorted(entry.path for entry in entries
+                           if entry.is_file() and entry.name.endswith('.csv'))
     results = []
     
     for csv_file in csv_files:
         try:
-            df = pd.read_csv(csv_file)
             table_name = Path(csv_file).stem
-            
+
             # 검색 타입에 따른 필터링
+            if search_type in ("stress", "temperature"):
+                # 응력/온도 검색은 관련 컬럼만 파싱하면 충분
+                keywords = _STRESS_KEYWORDS if search_type == "stress" else _TEMP_KEYWORDS
+                df = _read_matching_columns(csv_file, keywords)
+                if df is None:
+                    continue
+            else:
+                df = _load_table(csv_file)
+
             if search_type == "material":
                 # 재료 관련 검색
                 for col in df.columns:
-                    if search_term.lower() in str(col).lower():
+                    if term_lower in str(col).lower():
                         results.append({
                             'file': table_name,
                             'type': 'column_match',
@@ -42,52 +134,46 @@ def quick_search(search_term: str, search_type: str = "all"):
                             'sample_data': df.head(3).to_dict('records')
                         })
                 
-                # 데이터에서 재료명 검색
-                for idx, row in df.iterrows():
-                    for col in df.columns:
-                        if search_term.lower() in str(row[col]).lower():
-                            results.append({
-                                'file': table_name,
-                                'type': 'data_match',
-                                'row': idx,
-                                'column': col,
-                                'value': str(row[col])
-                            })
+                # 데이터에서 재료명 검색 (벡터화 마스크)
+                for idx, col, value in _find_cell_matches(df, search_term):
+                    results.append({
+                        'file': table_name,
+                        'type': 'data_match',
+                        'row': idx,
+                        'column': col,
+                        'value': value
+                    })
             
             elif search_type == "stress":
-                # 응력 값 검색
+                # 응력 값 검색 (관련 컬럼만 이미 파싱된 상태)
                 for col in df.columns:
-                    col_str = str(col).lower()
-                    if any(keyword in col_str for keyword in ['stress', 'ksi', 'mpa']):
-                        if search_term.lower() in col_str:
-                            numeric_data = pd.to_numeric(df[col], errors='coerce').dropna()
-                            if len(numeric_data) > 0:
-                                results.append({
-                                    'file': table_name,
-                                    'type': 'stress_data',
-                                    'column': col,
-                                    'min': numeric_data.min(),
-                                    'max': numeric_data.max(),
-                                    'mean': numeric_data.mean()
-                                })
-            
-            elif search_type == "temperature":
-                # 온도 데이터 검색
-                for col in df.columns:
-                    col_str = str(col).lower()
-                    if any(keyword in col_str for keyword in ['°f', 'f', 'temperature']):
-                        if search_term.lower() in col_str:
+                    if term_lower in str(col).lower():
+                        numeric_data = pd.to_numeric(df[col], errors='coerce').dropna()
+                        if len(numeric_data) > 0:
                             results.append({
                                 'file': table_name,
-                                'type': 'temperature_data',
+                                'type': 'stress_data',
                                 'column': col,
-                                'data': df[col].head(5).tolist()
+                                'min': numeric_data.min(),
+                                'max': numeric_data.max(),
+                                'mean': numeric_data.mean()
                             })
+
+            elif search_type == "temperature":
+                # 온도 데이터 검색 (관련 컬럼만 이미 파싱된 상태)
+                for col in df.columns:
+                    if term_lower in str(col).lower():
+                        results.append({
+                            'file': table_name,
+                            'type': 'temperature_data',
+                            'column': col,
+                            'data': df[col].head(5).tolist()
+                        })
             
             else:
                 # 전체 검색
                 for col in df.columns:
-                    if search_term.lower() in str(col).lower():
+                    if term_lower in str(col).lower():
                         results.append({
                             'file': table_name,
                             'type': 'column_match',
@@ -95,16 +181,14 @@ def quick_search(search_term: str, search_type: str = "all"):
                             'sample_data': df.head(3).to_dict('records')
                         })
                 
-                for idx, row in df.iterrows():
-                    for col in df.columns:
-                        if search_term.lower() in str(row[col]).lower():
-                            results.append({
-                                'file': table_name,
-                                'type': 'data_match',
-                                'row': idx,
-                                'column': col,
-                                'value': str(row[col])
-                            })
+                for idx, col, value in _find_cell_matches(df, search_term):
+                    results.append({
+                        'file': table_name,
+                        'type': 'data_match',
+                        'row': idx,
+                        'column': col,
+                        'value': value
+                    })
         
         except Exception as e:
             print(f"⚠️ 파일 읽기 오류: {csv_file} - {e}")
@@ -5,11 +5,150 @@ PDF에서 직접 텍스트를 추출하고 표 형태로 변환
 
 import fitz  # PyMuPDF
 import pandas as pd
+import numpy as np
 import re
-from typing import List, Dict, Optional
+import os
+from typing import Iterator, List, Dict, Optional, Tuple
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 
+# orjson(Rust 구현)이 있으면 보고서 직렬화에 사용 — 대형 dict에서 json 대비 수 배 빠름
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dump_json_report(report: Dict, report_path: Path) -> None:
+    """JSON 보고서 저장 (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        report_path.write_bytes(
+            orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+# MuPDF 내부 캐시 상한 — 전권 추출 시 페이지 리소스가 캐시에 쌓여
+# 메모리가 GB 단위로 커지는 것을 막기 위해 초과 시 캐시를 줄인다
+_FITZ_STORE_LIMIT = 256 << 20  # 256 MiB
+
+def _shrink_fitz_store():
+    """MuPDF 캐시가 상한을 넘으면 절반으로 축소"""
+    # store_size는 구버전에서는 속성, PyMuPDF 1.24+에서는 메서드
+    size = fitz.TOOLS.store_size
+    if callable(size):
+        size = size()
+    if (size or 0) > _FITZ_STORE_LIMIT:
+        fitz.TOOLS.store_shrink(50)
+
+# 행 판별/분리용 정규식 (호출마다 컴파일 캐시를 거치지 않도록 모듈 수준에서 컴파일)
+_NUMBER_RE = re.compile(r'\d+\.?\d*')
+_TEMP_RE = re.compile(r'\d+[°]?F')
+_MULTISPACE_RE = re.compile(r'\s{2,}')
+
+# 숫자/온도 패턴을 한 번의 스캔으로 함께 찾기 위한 결합 패턴
+# (온도를 앞에 두어 "100F"가 숫자가 아닌 온도로 먼저 매칭되도록 함)
+_ROW_SCAN_RE = re.compile(r'(?P<temp>\d+[°]?F)|(?P<num>\d+\.?\d*)')
+
+# ASME 관련 키워드 — 키워드별 substring 검사 대신 단일 교대 패턴으로 한 번에 검색
+_ASME_KEYWORDS = (
+    'sa-', 'astm', 'carbon', 'steel', 'alloy', 'nickel', 'chrome',
+    'molybdenum', 'titanium', 'aluminum', 'copper', 'brass',
+    'plate', 'pipe', 'tube', 'forging', 'cast', 'weld',
+)
+_ASME_KW_RE = re.compile('|'.join(_ASME_KEYWORDS), re.IGNORECASE)
+
+# pyahocorasick이 있으면 키워드 집합을 오토마톤으로 빌드 (사전 크기와 무관한 O(L) 검색)
+try:
+    import ahocorasick
+    _ASME_KW_AUTOMATON = ahocorasick.Automaton()
+    for _kw in _ASME_KEYWORDS:
+        _ASME_KW_AUTOMATON.add_word(_kw, _kw)
+    _ASME_KW_AUTOMATON.make_automaton()
+except ImportError:
+    _ASME_KW_AUTOMATON = None
+
+# numba가 있으면 행 분류의 문자 스캔을 JIT 컴파일된 커널로 수행
+# (정규식 엔진 호출 없이 바이트 버퍼를 직접 읽는다)
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _scan_row_bytes(buf):
+        """숫자 토큰 수를 세고 온도(숫자+(°)?F) 발견 시 조기 종료
+
+        반환: (숫자 토큰 수, 온도 존재 여부) — 기준 충족 시 바로 반환
+        """
+        n = buf.size
+        num_count = 0
+        i = 0
+        while i < n:
+            c = buf[i]
+            if 48 <= c <= 57:  # '0'-'9'
+                # 정수부 + 선택적 소수점 한 개 + 소수부 (\d+\.?\d* 와 동일한 토큰)
+                j = i + 1
+                while j < n and 48 <= buf[j] <= 57:
+                    j += 1
+                digits_end = j  # 마지막 숫자 다음 위치
+                if j < n and buf[j] == 46:  # '.'
+                    j += 1
+                    frac_start = j
+                    while j < n and 48 <= buf[j] <= 57:
+                        j += 1
+                    if j > frac_start:
+                        digits_end = j
+                num_count += 1
+                # 온도 검사: 숫자 바로 뒤 선택적 °(UTF-8: 0xC2 0xB0) + 'F'
+                # (\d+[°]?F 와 같이 소수점 끝이 아니라 숫자 끝에서만 검사)
+                if digits_end == j:
+                    k = j
+                    if k + 1 < n and buf[k] == 0xC2 and buf[k + 1] == 0xB0:
+                        k += 2
+                    if k < n and buf[k] == 70:  # 'F'
+                        return num_count, True
+                if num_count >= 2:
+                    return num_count, False
+                i = j
+            else:
+                i += 1
+        return num_count, False
+except ImportError:
+    _scan_row_bytes = None
+
+def _has_asme_keyword(line: str) -> bool:
+    """ASME 키워드 포함 여부 (오토마톤 우선, 없으면 교대 정규식)
+
+    대소문자 처리는 오토마톤 경로에서는 행당 한 번의 lower()로,
+    정규식 경로에서는 IGNORECASE 플래그로 수행한다 — 키워드마다
+    lower() 복사본을 만들지 않는다.
+    """
+    if _ASME_KW_AUTOMATON is not None:
+        return next(_ASME_KW_AUTOMATON.iter(line.lower()), None) is not None
+    return _ASME_KW_RE.search(line) is not None
+
+@lru_cache(maxsize=1)
+def _worker_state(pdf_path: str):
+    """워커 프로세스별로 추출기와 PDF 문서를 한 번만 생성해 재사용"""
+    extractor = SimpleASMEExtractor(pdf_path)
+    doc = fitz.open(pdf_path)
+    return extractor, doc
+
+def _process_page(pdf_path: str, page_num: int) -> List[Tuple[int, pd.DataFrame]]:
+    """한 페이지의 표를 추출 (프로세스 풀 워커 — CSV 저장은 부모에서 수행)"""
+    extractor, doc = _worker_state(pdf_path)
+    text = doc[page_num - 1].get_text()
+    _shrink_fitz_store()
+
+    tables = []
+    for i, table_lines in enumerate(extractor.find_table_patterns(text)):
+        if len(table_lines) >= 3:  # 최소 3행 이상
+            table_df = extractor.parse_table_text(table_lines)
+            if table_df is not None and not table_df.empty:
+                tables.append((i, table_df))
+    return tables
+
 class SimpleASMEExtractor:
     """간단한 ASME 데이터 추출기"""
     
@@ -18,138 +157,239 @@ class SimpleASMEExtractor:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
-    def extract_text_from_pdf(self, page_range: Optional[tuple] = None) -> Dict[int, str]:
-        """PDF에서 텍스트 추출"""
+    def extract_text_from_pdf(self, page_range: Optional[tuple] = None) -> Iterator[Tuple[int, str]]:
+        """PDF에서 텍스트 추출 — (페이지 번호, 텍스트)를 한 페이지씩 생성
+
+        전체 텍스트를 딕셔너리로 모아 두지 않고 스트리밍해 피크 메모리를
+        페이지 한 장 분량으로 유지한다.
+        """
         doc = fitz.open(self.pdf_path)
-        pages_text = {}
-        
-        if page_range:
-            start_page, end_page = page_range
-            pages = range(start_page - 1, min(end_page, len(doc)))
-        else:
-            pages = range(len(doc))
-        
-        for page_num in pages:
-            page = doc[page_num]
-            text = page.get_text()
-            pages_text[page_num + 1] = text
-        
-        doc.close()
-        return pages_text
+        try:
+            if page_range:
+                start_page, end_page = page_range
+                pages = range(start_page - 1, min(end_page, len(doc)))
+            else:
+                pages = range(len(doc))
+
+            for page_num in pages:
+                page = doc[page_num]
+                text = page.get_text()
+                page = None  # 페이지 객체를 바로 해제해 MuPDF 버퍼 반환
+                _shrink_fitz_store()  # 페이지 리소스가 캐시에 누적되지 않도록 상한 유지
+                yield page_num + 1, text
+        finally:
+            doc.close()
     
     def find_table_patterns(self, text: str) -> List[List[str]]:
-        """텍스트에서 표 패턴 찾기"""
-        lines = text.split('\n')
-        tables = []
-        current_table = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_table:
-                    tables.append(current_table)
-                    current_table = []
+        """텍스트에서 표 패턴 찾기
+
+        행 단위 파이썬 루프 대신 pandas 벡터화 마스크로 페이지 전체를
+        한 번에 분류하고, 연속된 표 행 구간을 묶어 표로 반환한다.
+        numba 커널이 있으면 행별 str 할당이 없는 바이트 버퍼 경로를 쓴다.
+        """
+        if _scan_row_bytes is not None:
+            return self._find_table_patterns_bytes(text)
+
+        lines = pd.Series(text.split('\n'), dtype=object).str.strip()
+        if lines.empty:
+            return []
+
+        # 표 패턴 감지 (숫자와 텍스트가 혼재된 행) — _is_table_row와 같은 기준
+        is_row = (
+            (lines.str.count(r'\S+') >= 3)
+            & ((lines.str.count(_NUMBER_RE) >= 2)
+               | lines.str.contains(_TEMP_RE)
+               | lines.str.contains(_ASME_KW_RE))
+        )
+
+        # 연속된 True 구간을 run 단위로 묶어 각각을 하나의 표로 반환
+        runs = (is_row != is_row.shift()).cumsum()
+        return [group.tolist() for _, group in lines[is_row].groupby(runs[is_row])]
+
+    def _find_table_patterns_bytes(self, text: str) -> List[List[str]]:
+        """바이트 버퍼 기반 표 패턴 탐색 (numba 커널 경로)
+
+        페이지 텍스트를 UTF-8 버퍼 하나로 인코딩해 두고 행 경계를 버퍼
+        오프셋으로 따라가며 분류한다 — 표 행으로 판정된 행만 str로 복원해
+        행마다 문자열 객체를 만들지 않는다.
+        """
+        buf = text.encode('utf-8')
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        tables: List[List[str]] = []
+        current: List[str] = []
+        pos, n = 0, len(buf)
+
+        while pos < n:
+            newline = buf.find(b'\n', pos)
+            if newline == -1:
+                newline = n
+
+            # strip: 행 양끝 공백을 오프셋 이동으로 제거
+            start, end = pos, newline
+            while start < end and buf[start] in b' \t\r':
+                start += 1
+            while end > start and buf[end - 1] in b' \t\r':
+                end -= 1
+            pos = newline + 1
+
+            if start == end:
+                # 빈 행 — 진행 중인 표 종료
+                if current:
+                    tables.append(current)
+                    current = []
                 continue
-            
-            # 표 패턴 감지 (숫자와 텍스트가 혼재된 행)
-            if self._is_table_row(line):
-                current_table.append(line)
-            else:
-                if current_table:
-                    tables.append(current_table)
-                    current_table = []
-        
-        if current_table:
-            tables.append(current_table)
-        
+
+            line_view = arr[start:end]
+
+            # 단어 수 확인 (공백→비공백 전이 횟수)
+            whitespace = (line_view == 32) | (line_view == 9)
+            nonspace = ~whitespace
+            word_count = int(np.count_nonzero(nonspace[1:] & whitespace[:-1]))
+            if nonspace[0]:
+                word_count += 1
+
+            is_row = False
+            if word_count >= 3:
+                num_count, has_temp = _scan_row_bytes(line_view)
+                if has_temp or num_count >= 2:
+                    is_row = True
+                    current.append(buf[start:end].decode('utf-8'))
+                else:
+                    line = buf[start:end].decode('utf-8')
+                    if _has_asme_keyword(line):
+                        is_row = True
+                        current.append(line)
+
+            if not is_row and current:
+                tables.append(current)
+                current = []
+
+        if current:
+            tables.append(current)
+
         return tables
     
     def _is_table_row(self, line: str) -> bool:
-        """표 행인지 판단"""
+        """표 행인지 판단 (find_table_patterns 벡터화 마스크와 같은 기준의 행 단위 검사)"""
         # 숫자와 텍스트가 혼재되어 있는지 확인
         words = line.split()
         if len(words) < 3:
             return False
         
-        # 숫자 패턴 확인
-        number_pattern = r'\d+\.?\d*'
-        numbers = re.findall(number_pattern, line)
-        
-        # 온도 패턴 확인 (예: 100F, 200°F)
-        temp_pattern = r'\d+[°]?F'
-        temps = re.findall(temp_pattern, line)
-        
-        # ASME 관련 키워드 확인
-        asme_keywords = [
-            'SA-', 'ASTM', 'Carbon', 'Steel', 'Alloy', 'Nickel', 'Chrome',
-            'Molybdenum', 'Titanium', 'Aluminum', 'Copper', 'Brass',
-            'Plate', 'Pipe', 'Tube', 'Forging', 'Cast', 'Weld'
-        ]
-        
-        has_keywords = any(keyword.lower() in line.lower() for keyword in asme_keywords)
-        
-        # 숫자가 2개 이상 있거나 온도가 있거나 ASME 키워드가 있으면 표 행으로 판단
-        return len(numbers) >= 2 or len(temps) >= 1 or has_keywords
+        # 숫자/온도 패턴 확인 — 한 번의 스캔으로 개수를 세고 기준을 넘는 즉시 중단
+        if _scan_row_bytes is not None:
+            # JIT 커널: 바이트 버퍼를 정규식 없이 직접 스캔
+            buf = np.frombuffer(line.encode('utf-8'), dtype=np.uint8)
+            num_count, has_temp = _scan_row_bytes(buf)
+            if has_temp or num_count >= 2:
+                return True
+        else:
+            num_count = 0
+            for match in _ROW_SCAN_RE.finditer(line):
+                if match.lastgroup == 'temp':
+                    # 온도가 하나라도 있으면 표 행 (예: 100F, 200°F)
+                    return True
+                num_count += 1
+                if num_count >= 2:
+                    # 숫자가 2개 이상이면 표 행
+                    return True
+            # 결합 패턴은 "12.5F"처럼 소수 토큰이 겹치는 온도("5F")를 가리므로
+            # 기준 미달로 끝났을 때만 온도 패턴으로 한 번 더 확인한다
+            if _TEMP_RE.search(line) is not None:
+                return True
+
+        # ASME 관련 키워드 확인 (오토마톤/정규식으로 한 번만 스캔)
+        return _has_asme_keyword(line)
     
     def parse_table_text(self, table_lines: List[str]) -> Optional[pd.DataFrame]:
         """표 텍스트를 DataFrame으로 변환"""
         if not table_lines:
             return None
         
-        # 각 행을 컬럼으로 분리
+        # 각 행을 컬럼으로 분리 (행마다 공백 2+ 기준 분리)
+        # 고정 오프셋 슬라이싱은 기준 행보다 긴 셀을 중간에서 자르므로 쓰지 않고,
+        # 최대 컬럼 수는 분리하면서 함께 추적해 별도 재스캔을 없앤다
         parsed_rows = []
+        max_cols = 0
         for line in table_lines:
-            # 여러 공백을 하나로 변환하고 분리
-            columns = re.split(r'\s{2,}', line.strip())
+            columns = _MULTISPACE_RE.split(line.strip())
             if columns:
                 parsed_rows.append(columns)
-        
+                if len(columns) > max_cols:
+                    max_cols = len(columns)
+
         if not parsed_rows:
             return None
-        
-        # 가장 긴 행의 길이에 맞춰 패딩
-        max_cols = max(len(row) for row in parsed_rows)
-        padded_rows = []
-        for row in parsed_rows:
-            padded_row = row + [''] * (max_cols - len(row))
-            padded_rows.append(padded_row)
-        
+
+        # 행별 리스트 패딩 대신 object 배열 한 번 할당 후 채우기
+        arr = np.full((len(parsed_rows), max_cols), '', dtype=object)
+        for i, row in enumerate(parsed_rows):
+            arr[i, :len(row)] = row
+
         # DataFrame 생성
-        df = pd.DataFrame(padded_rows)
-        
+        df = pd.DataFrame(arr)
+
         # 첫 번째 행을 헤더로 사용
         if len(df) > 0:
             df.columns = df.iloc[0]
-            df = df.iloc[1:]
-        
+            df = df.iloc[1:].reset_index(drop=True)
+
         return df
     
     def extract_asme_data(self, page_range: Optional[tuple] = None) -> Dict[str, pd.DataFrame]:
-        """ASME 데이터 추출"""
+        """ASME 데이터 추출 (페이지 단위 프로세스 풀 병렬화)"""
         print("텍스트 추출 시작...")
-        pages_text = self.extract_text_from_pdf(page_range)
-        
+
+        doc = fitz.open(self.pdf_path)
+        total_pages = len(doc)
+        doc.close()
+
+        if page_range:
+            start_page, end_page = page_range
+            page_nums = range(start_page, min(end_page, total_pages) + 1)
+        else:
+            page_nums = range(1, total_pages + 1)
+
         all_tables = {}
-        
-        for page_num, text in pages_text.items():
-            print(f"페이지 {page_num} 처리 중...")
-            
-            # 표 패턴 찾기
-            table_patterns = self.find_table_patterns(text)
-            
-            for i, table_lines in enumerate(table_patterns):
-                if len(table_lines) >= 3:  # 최소 3행 이상
-                    table_df = self.parse_table_text(table_lines)
-                    if table_df is not None and not table_df.empty:
-                        table_name = f"Page_{page_num}_Table_{i+1}"
-                        all_tables[table_name] = table_df
-                        
-                        # CSV로 저장
-                        csv_path = self.output_dir / f"{table_name}.csv"
-                        table_df.to_csv(csv_path, index=False)
-                        print(f"표 저장: {csv_path}")
-        
+
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(page_nums) < 4:
+            # 작은 작업은 풀 기동 비용이 더 큼 — 순차 처리
+            page_results = ((page_num, _process_page(self.pdf_path, page_num))
+                            for page_num in page_nums)
+            self._collect_tables(page_results, all_tables)
+        else:
+            # 페이지별 추출은 서로 독립 — 코어 수만큼 병렬화 (CSV 저장은 부모에서)
+            with ProcessPoolExecutor() as executor:
+                page_results = zip(page_nums,
+                                   executor.map(_process_page, repeat(self.pdf_path),
+                                                page_nums, chunksize=8))
+                self._collect_tables(page_results, all_tables)
+
         return all_tables
+
+    def _collect_tables(self, page_results, all_tables: Dict[str, pd.DataFrame]) -> None:
+        """페이지별 추출 결과를 모으고 CSV로 일괄 저장"""
+        for page_num, tables in page_results:
+            print(f"페이지 {page_num} 처리 중...")
+            for i, table_df in tables:
+                table_name = f"Page_{page_num}_Table_{i+1}"
+                all_tables[table_name] = table_df
+
+        # 표마다 파일을 바로 여닫는 대신 모아서 스레드 풀로 일괄 저장
+        self._write_tables_csv(all_tables)
+
+    def _write_tables_csv(self, tables: Dict[str, pd.DataFrame]) -> None:
+        """수집된 표들을 CSV로 저장 (4-스레드 병렬 쓰기)"""
+        def _write(item):
+            name, df = item
+            csv_path = self.output_dir / f"{name}.csv"
+            df.to_csv(csv_path, index=False)
+            return csv_path
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for csv_path in pool.map(_write, tables.items()):
+                print(f"표 저장: {csv_path}")
     
     def generate_summary_report(self, tables: Dict[str, pd.DataFrame]) -> None:
         """요약 보고서 생성"""
@@ -171,9 +411,8 @@ class SimpleASMEExtractor:
         
         # JSON 보고서 저장
         report_path = self.output_dir / "simple_extraction_report.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-        
+        _dump_json_report(report, report_path)
+
         print(f"요약 보고서 저장: {report_path}")
 
 def main():
@@ -5,11 +5,59 @@ ASME 표 찾기 스크립트
 
 import fitz  # PyMuPDF
 import pandas as pd
+import numpy as np
 import re
+import os
 from typing import List, Dict, Optional
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 
+# 검색 보고서에는 페이지별 매치 목록이 전부 들어가므로 직렬화가 꽤 커진다
+# — orjson이 설치돼 있으면 그쪽으로 저장
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# MuPDF 내부 캐시 상한 — 전권 검색 시 메모리 폭증 방지
+_FITZ_STORE_LIMIT = 256 << 20  # 256 MiB
+
+def _shrink_fitz_store():
+    """MuPDF 캐시가 상한을 넘으면 절반으로 축소"""
+    # store_size는 구버전에서는 속성, PyMuPDF 1.24+에서는 메서드
+    size = fitz.TOOLS.store_size
+    if callable(size):
+        size = size()
+    if (size or 0) > _FITZ_STORE_LIMIT:
+        fitz.TOOLS.store_shrink(50)
+
+# 표 제목/온도/응력 헤더를 한 번의 스캔으로 함께 찾는 결합 패턴
+# (제목·응력은 기존과 같이 대소문자 무시, 온도는 대문자 F만 — 그룹별 인라인 플래그)
+_PAGE_SCAN_RE = re.compile(
+    r'(?P<title>(?i:table\s+(?:\d+[a-z]?|[a-z]-\d+|[a-z]{2}-\d+|tcd)))'
+    r'|(?P<temp>\d+\s*°?F)'
+    r'|(?P<stress>(?i:allowable\s+stress|design\s+stress|sm|ksi|mpa))'
+)
+
+@lru_cache(maxsize=1)
+def _worker_finder(pdf_path: str) -> "ASMETableFinder":
+    """워커 프로세스별로 찾기 객체(열린 PDF 포함)를 한 번만 생성해 재사용"""
+    return ASMETableFinder(pdf_path)
+
+def _scan_page(pdf_path: str, page_num: int) -> Optional[Dict]:
+    """한 페이지에서 표 단서를 스캔 (프로세스 풀 워커)"""
+    finder = _worker_finder(pdf_path)
+    text = finder._get_doc()[page_num - 1].get_text()
+    _shrink_fitz_store()
+    return finder._scan_page_text(text)
+
+def _extract_page_table(pdf_path: str, page_num: int) -> Optional[pd.DataFrame]:
+    """한 페이지의 표 데이터를 추출 (프로세스 풀 워커 — CSV 저장은 부모에서)"""
+    return _worker_finder(pdf_path).extract_table_data(page_num)
+
 class ASMETableFinder:
     """ASME 표 찾기 클래스"""
     
@@ -17,7 +65,8 @@ class ASMETableFinder:
         self.pdf_path = pdf_path
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        
+        self._doc = None  # 한 번 연 PDF 문서를 재사용 (지연 오픈)
+
         # 실제 ASME 표 제목 패턴
         self.table_title_patterns = [
             r'Table\s+\d+[A-Z]?',  # Table 1A, Table 2B 등
@@ -35,93 +84,134 @@ class ASMETableFinder:
         self.stress_headers = [
             r'Allowable\s+Stress', r'Design\s+Stress', r'Sm', r'ksi', r'MPa'
         ]
-    
+        # 실제 스캔은 위 패턴들을 합친 모듈 수준 결합 패턴(_PAGE_SCAN_RE)으로 수행
+
+    def _get_doc(self) -> fitz.Document:
+        """PDF 문서를 한 번만 열고 이후 호출에서 재사용"""
+        if self._doc is None:
+            self._doc = fitz.open(self.pdf_path)
+        return self._doc
+
+    def close(self):
+        """열어 둔 PDF 문서 닫기"""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _scan_page_text(self, text: str) -> Optional[Dict]:
+        """페이지 텍스트에서 표 단서 수집 (표 가능성이 없으면 None)"""
+        # 1차 스캔: 포함 조건(제목 1개, 또는 온도 3개+응력 1개)이 충족되는
+        # 즉시 중단 — 탈락 페이지도 조건 판정에 필요한 만큼만 읽는다
+        qualifies = False
+        temp_count = 0
+        has_stress = False
+        for match in _PAGE_SCAN_RE.finditer(text):
+            group = match.lastgroup
+            if group == 'title':
+                qualifies = True
+                break
+            elif group == 'temp':
+                # 기준 패턴 목록은 공백 없는 온도(100F, 100°F)를 두 패턴이 겹쳐
+                # 두 번 세었다 — 포함 판정이 달라지지 않도록 같은 가중치를 준다
+                temp_count += 1 if any(ch.isspace() for ch in match.group()) else 2
+            else:
+                has_stress = True
+            if temp_count >= 3 and has_stress:
+                qualifies = True
+                break
+
+        if not qualifies:
+            return None
+
+        # 2차 스캔: 포함이 확정된 페이지만 보고서용 전체 매치를 수집
+        table_titles = []
+        temp_headers = []
+        stress_headers = []
+        buckets = {'title': table_titles, 'temp': temp_headers, 'stress': stress_headers}
+        for match in _PAGE_SCAN_RE.finditer(text):
+            buckets[match.lastgroup].append(match.group())
+
+        return {
+            'table_titles': table_titles,
+            'temp_headers': temp_headers,
+            'stress_headers': stress_headers,
+            'text_sample': text[:500]  # 처음 500자
+        }
+
     def find_table_pages(self, page_range: Optional[tuple] = None) -> Dict[int, List[str]]:
-        """표가 있는 페이지 찾기"""
-        doc = fitz.open(self.pdf_path)
-        table_pages = {}
-        
+        """표가 있는 페이지 찾기 (페이지 단위 프로세스 풀 병렬화)"""
+        doc = self._get_doc()
+
         if page_range:
             start_page, end_page = page_range
-            pages = range(start_page - 1, min(end_page, len(doc)))
+            pages = range(start_page, min(end_page, len(doc)) + 1)
         else:
-            pages = range(len(doc))
-        
-        for page_num in pages:
-            page = doc[page_num]
-            text = page.get_text()
-            
-            # 표 제목 찾기
-            table_titles = []
-            for pattern in self.table_title_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                table_titles.extend(matches)
-            
-            # 온도 헤더 찾기
-            temp_headers = []
-            for pattern in self.temperature_headers:
-                matches = re.findall(pattern, text)
-                temp_headers.extend(matches)
-            
-            # 응력 헤더 찾기
-            stress_headers = []
-            for pattern in self.stress_headers:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                stress_headers.extend(matches)
-            
-            # 표가 있을 가능성이 있는 페이지
-            if table_titles or (len(temp_headers) >= 3 and len(stress_headers) >= 1):
-                table_pages[page_num + 1] = {
-                    'table_titles': table_titles,
-                    'temp_headers': temp_headers,
-                    'stress_headers': stress_headers,
-                    'text_sample': text[:500]  # 처음 500자
-                }
-        
-        doc.close()
+            pages = range(1, len(doc) + 1)
+
+        table_pages = {}
+
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(pages) < 4:
+            # 작은 작업은 풀 기동 비용이 더 큼 — 순차 처리
+            for page_num in pages:
+                text = doc[page_num - 1].get_text()
+                _shrink_fitz_store()  # 페이지 리소스가 캐시에 누적되지 않도록 상한 유지
+                info = self._scan_page_text(text)
+                if info is not None:
+                    table_pages[page_num] = info
+        else:
+            # 페이지별 스캔은 서로 독립 — 코어 수만큼 병렬화
+            with ProcessPoolExecutor() as executor:
+                for page_num, info in zip(pages,
+                                          executor.map(_scan_page, repeat(self.pdf_path),
+                                                       pages, chunksize=8)):
+                    if info is not None:
+                        table_pages[page_num] = info
+
         return table_pages
-    
+
     def extract_table_data(self, page_num: int) -> Optional[pd.DataFrame]:
         """특정 페이지에서 표 데이터 추출"""
-        doc = fitz.open(self.pdf_path)
-        page = doc[page_num - 1]
-        
-        # 페이지의 텍스트 블록을 좌표별로 추출
-        blocks = page.get_text("dict")["blocks"]
-        
-        # 텍스트를 좌표 순서대로 정렬
-        text_elements = []
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text_elements.append({
-                            'text': span["text"],
-                            'x': span["bbox"][0],
-                            'y': span["bbox"][1],
-                            'width': span["bbox"][2] - span["bbox"][0],
-                            'height': span["bbox"][3] - span["bbox"][1]
-                        })
-        
-        # Y 좌표로 그룹화 (행)
-        rows = {}
-        for element in text_elements:
-            y_key = round(element['y'] / 10) * 10  # 10픽셀 단위로 그룹화
-            if y_key not in rows:
-                rows[y_key] = []
-            rows[y_key].append(element)
-        
-        # 각 행을 X 좌표로 정렬
-        table_data = []
-        for y_key in sorted(rows.keys()):
-            row_elements = sorted(rows[y_key], key=lambda x: x['x'])
-            row_text = [elem['text'] for elem in row_elements]
-            table_data.append(row_text)
-        
-        doc.close()
-        
-        if not table_data:
+        page = self._get_doc()[page_num - 1]
+
+        # PyMuPDF 1.23+ 내장 표 감지(C 구현)를 우선 사용
+        if hasattr(page, "find_tables"):
+            tabs = page.find_tables(strategy="lines_strict")
+            if tabs.tables:
+                df = pd.DataFrame(tabs[0].extract())
+                if len(df) > 0:
+                    df.columns = df.iloc[0]
+                    df = df.iloc[1:]
+                return df if not df.empty else None
+
+        # 내장 감지가 없거나 표를 찾지 못하면 좌표 군집 휴리스틱으로 대체
+        return self._extract_table_by_coords(page)
+
+    def _extract_table_by_coords(self, page) -> Optional[pd.DataFrame]:
+        """텍스트 좌표 군집으로 표 추출 (find_tables가 없을 때의 대체 경로)"""
+        # 중첩 dict(블록→라인→span) 역직렬화 대신 평면 튜플 목록으로 추출
+        # — (x0, y0, x1, y1, 단어, ...) 형태라 폰트 메타데이터 객체 생성이 없다
+        words = page.get_text("words")
+
+        if not words:
             return None
+
+        # Y 버킷(10픽셀 단위)→X 순으로 한 번에 정렬한 뒤 버킷 경계에서 분할
+        # (딕셔너리 버킷팅 + 행별 재정렬 대신 단일 lexsort 패스)
+        xs = np.asarray([w[0] for w in words])
+        y_buckets = np.rint(np.asarray([w[1] for w in words]) / 10).astype(int)
+        texts = np.asarray([w[4] for w in words], dtype=object)
+
+        order = np.lexsort((xs, y_buckets))
+        y_buckets = y_buckets[order]
+        splits = np.where(np.diff(y_buckets) != 0)[0] + 1
+        table_data = [row.tolist() for row in np.split(texts[order], splits)]
         
         # DataFrame 생성
         df = pd.DataFrame(table_data)
@@ -141,24 +231,41 @@ class ASMETableFinder:
         print(f"표가 있을 가능성이 있는 페이지: {len(table_pages)}개")
         
         extracted_tables = {}
-        
-        for page_num, page_info in table_pages.items():
+
+        # 후보 페이지의 표 추출도 서로 독립 — 코어 수만큼 병렬화 (CSV 저장은 부모에서)
+        page_nums = list(table_pages.keys())
+        workers = os.cpu_count() or 1
+        if workers == 1 or len(page_nums) < 4:
+            page_tables = [(page_num, self.extract_table_data(page_num))
+                           for page_num in page_nums]
+        else:
+            with ProcessPoolExecutor() as executor:
+                page_tables = list(zip(page_nums,
+                                       executor.map(_extract_page_table, repeat(self.pdf_path),
+                                                    page_nums, chunksize=8)))
+
+        for page_num, table_df in page_tables:
+            page_info = table_pages[page_num]
             print(f"\n페이지 {page_num} 분석:")
             print(f"  표 제목: {page_info['table_titles']}")
             print(f"  온도 헤더: {page_info['temp_headers'][:5]}...")  # 처음 5개만
             print(f"  응력 헤더: {page_info['stress_headers']}")
-            
-            # 표 데이터 추출 시도
-            table_df = self.extract_table_data(page_num)
+
             if table_df is not None and not table_df.empty:
                 table_name = f"Page_{page_num}_Table"
                 extracted_tables[table_name] = table_df
-                
-                # CSV로 저장
-                csv_path = self.output_dir / f"{table_name}.csv"
-                table_df.to_csv(csv_path, index=False)
+
+        # 표마다 파일을 바로 여닫는 대신 모아서 스레드 풀로 일괄 저장
+        def _write(item):
+            name, df = item
+            csv_path = self.output_dir / f"{name}.csv"
+            df.to_csv(csv_path, index=False)
+            return csv_path
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for csv_path in pool.map(_write, extracted_tables.items()):
                 print(f"  표 저장: {csv_path}")
-        
+
         return extracted_tables
     
     def generate_search_report(self, table_pages: Dict, extracted_tables: Dict) -> None:
@@ -181,11 +288,15 @@ class ASMETableFinder:
                 "sample_data": df.head(3).to_dict('records') if not df.empty else []
             }
         
-        # JSON 보고서 저장
+        # JSON 보고서 저장 (orjson 우선, 없으면 표준 json)
         report_path = self.output_dir / "table_search_report.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-        
+        if orjson is not None:
+            report_path.write_bytes(
+                orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+
         print(f"검색 보고서 저장: {report_path}")
 
 def main():
@@ -197,16 +308,15 @@ def main():
         print(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
         return
     
-    # 표 찾기 초기화
-    finder = ASMETableFinder(pdf_path, "output")
-    
-    # 표 검색 및 추출 (처음 50페이지만 테스트)
-    print("ASME 표 검색 및 추출 시작...")
-    table_pages = finder.find_table_pages(page_range=(1, 50))
-    extracted_tables = finder.search_and_extract_tables(page_range=(1, 50))
-    
-    # 검색 결과 보고서 생성
-    finder.generate_search_report(table_pages, extracted_tables)
+    # 표 찾기 초기화 (with 블록 종료 시 PDF 문서 닫기)
+    with ASMETableFinder(pdf_path, "output") as finder:
+        # 표 검색 및 추출 (처음 50페이지만 테스트)
+        print("ASME 표 검색 및 추출 시작...")
+        table_pages = finder.find_table_pages(page_range=(1, 50))
+        extracted_tables = finder.search_and_extract_tables(page_range=(1, 50))
+
+        # 검색 결과 보고서 생성
+        finder.generate_search_report(table_pages, extracted_tables)
     
     print(f"\n검색 완료!")
     print(f"표가 있을 가능성이 있는 페이지: {len(table_pages)}개")